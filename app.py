@@ -23,7 +23,7 @@ from backend.auth.auth_utils import get_authenticated_user_details
 from backend.security.ms_defender_utils import get_msdefender_user_json
 from backend.history.cosmosdbservice import CosmosConversationClient
 from backend.settings import (
-    app_settings,
+    get_app_settings,
     MINIMUM_SUPPORTED_AZURE_OPENAI_PREVIEW_API_VERSION
 )
 from backend.utils import (
@@ -46,6 +46,7 @@ def create_app():
 
 @bp.route("/")
 async def index():
+    app_settings = get_app_settings()
     return await render_template(
         "index.html",
         title=app_settings.ui.title,
@@ -72,22 +73,24 @@ USER_AGENT = "GitHubSampleWebApp/AsyncAzureOpenAI/1.0.0"
 
 
 # Frontend Settings via Environment Variables
-frontend_settings = {
-    "auth_enabled": app_settings.base_settings.auth_enabled,
-    "feedback_enabled": (
-        app_settings.chat_history and
-        app_settings.chat_history.enable_feedback
-    ),
-    "ui": {
-        "title": app_settings.ui.title,
-        "logo": app_settings.ui.logo,
-        "chat_logo": app_settings.ui.chat_logo or app_settings.ui.logo,
-        "chat_title": app_settings.ui.chat_title,
-        "chat_description": app_settings.ui.chat_description,
-        "show_share_button": app_settings.ui.show_share_button,
-    },
-    "sanitize_answer": app_settings.base_settings.sanitize_answer,
-}
+def load_frontend_settings():
+    app_settings = get_app_settings()
+    return {
+        "auth_enabled": app_settings.base_settings.auth_enabled,
+        "feedback_enabled": (
+            app_settings.chat_history and
+            app_settings.chat_history.enable_feedback
+        ),
+        "ui": {
+            "title": app_settings.ui.title,
+            "logo": app_settings.ui.logo,
+            "chat_logo": app_settings.ui.chat_logo or app_settings.ui.logo,
+            "chat_title": app_settings.ui.chat_title,
+            "chat_description": app_settings.ui.chat_description,
+            "show_share_button": app_settings.ui.show_share_button,
+        },
+        "sanitize_answer": app_settings.base_settings.sanitize_answer,
+    }
 
 
 # Enable Microsoft Defender for Cloud Integration
@@ -96,6 +99,7 @@ MS_DEFENDER_ENABLED = os.environ.get("MS_DEFENDER_ENABLED", "true").lower() == "
 
 # Initialize Azure OpenAI Client
 def init_openai_client():
+    app_settings = get_app_settings()
     azure_openai_client = None
     try:
         # API version check
@@ -155,6 +159,7 @@ def init_openai_client():
 
 
 def init_cosmosdb_client():
+    app_settings = get_app_settings()
     cosmos_conversation_client = None
     if app_settings.chat_history:
         try:
@@ -185,6 +190,7 @@ def init_cosmosdb_client():
 
 
 def prepare_model_args(request_body, request_headers):
+    app_settings = get_app_settings()
     request_messages = request_body.get("messages", [])
     messages = []
     if not app_settings.datasource:
@@ -229,46 +235,50 @@ def prepare_model_args(request_body, request_headers):
             ]
         }
 
-    model_args_clean = copy.deepcopy(model_args)
-    if model_args_clean.get("extra_body"):
-        secret_params = [
-            "key",
-            "connection_string",
-            "embedding_key",
-            "encoded_api_key",
-            "api_key",
-        ]
-        for secret_param in secret_params:
-            if model_args_clean["extra_body"]["data_sources"][0]["parameters"].get(
-                secret_param
-            ):
-                model_args_clean["extra_body"]["data_sources"][0]["parameters"][
+    # The sanitized copy only feeds the debug log; skip the deep copy and
+    # JSON encoding of the whole payload when debug logging is off.
+    if logging.getLogger().isEnabledFor(logging.DEBUG):
+        model_args_clean = copy.deepcopy(model_args)
+        if model_args_clean.get("extra_body"):
+            secret_params = [
+                "key",
+                "connection_string",
+                "embedding_key",
+                "encoded_api_key",
+                "api_key",
+            ]
+            for secret_param in secret_params:
+                if model_args_clean["extra_body"]["data_sources"][0]["parameters"].get(
                     secret_param
-                ] = "*****"
-        authentication = model_args_clean["extra_body"]["data_sources"][0][
-            "parameters"
-        ].get("authentication", {})
-        for field in authentication:
-            if field in secret_params:
-                model_args_clean["extra_body"]["data_sources"][0]["parameters"][
-                    "authentication"
-                ][field] = "*****"
-        embeddingDependency = model_args_clean["extra_body"]["data_sources"][0][
-            "parameters"
-        ].get("embedding_dependency", {})
-        if "authentication" in embeddingDependency:
-            for field in embeddingDependency["authentication"]:
+                ):
+                    model_args_clean["extra_body"]["data_sources"][0]["parameters"][
+                        secret_param
+                    ] = "*****"
+            authentication = model_args_clean["extra_body"]["data_sources"][0][
+                "parameters"
+            ].get("authentication", {})
+            for field in authentication:
                 if field in secret_params:
                     model_args_clean["extra_body"]["data_sources"][0]["parameters"][
-                        "embedding_dependency"
-                    ]["authentication"][field] = "*****"
-
-    logging.debug(f"REQUEST BODY: {json.dumps(model_args_clean, indent=4)}")
+                        "authentication"
+                    ][field] = "*****"
+            embeddingDependency = model_args_clean["extra_body"]["data_sources"][0][
+                "parameters"
+            ].get("embedding_dependency", {})
+            if "authentication" in embeddingDependency:
+                for field in embeddingDependency["authentication"]:
+                    if field in secret_params:
+                        model_args_clean["extra_body"]["data_sources"][0]["parameters"][
+                            "embedding_dependency"
+                        ]["authentication"][field] = "*****"
+
+        logging.debug(f"REQUEST BODY: {json.dumps(model_args_clean, indent=4)}")
 
     return model_args
 
 
 async def promptflow_request(request):
+    app_settings = get_app_settings()
     try:
         headers = {
             "Content-Type": "application/json",
@@ -324,6 +334,7 @@ async def send_chat_request(request_body, request_headers):
 
 
 async def complete_chat_request(request_body, request_headers):
+    app_settings = get_app_settings()
     if app_settings.base_settings.use_promptflow:
         response = await promptflow_request(request_body)
         history_metadata = request_body.get("history_metadata", {})
@@ -351,6 +362,7 @@ async def stream_chat_request(request_body, request_headers):
 
 
 async def conversation_internal(request_body, request_headers):
+    app_settings = get_app_settings()
     try:
         if app_settings.azure_openai.stream:
             result = await stream_chat_request(request_body, request_headers)
@@ -382,7 +394,7 @@ async def conversation():
 @bp.route("/frontend_settings", methods=["GET"])
 def get_frontend_settings():
     try:
-        return jsonify(frontend_settings), 200
+        return jsonify(load_frontend_settings()), 200
     except Exception as e:
         logging.exception("Exception in /frontend_settings")
         return jsonify({"error": str(e)}), 500
@@ -795,6 +807,7 @@ async def clear_messages():
 
 @bp.route("/history/ensure", methods=["GET"])
 async def ensure_cosmos():
+    app_settings = get_app_settings()
     if not app_settings.chat_history:
         return jsonify({"error": "CosmosDB is not configured"}), 404
 
@@ -836,6 +849,7 @@ async def ensure_cosmos():
 
 
 async def generate_title(conversation_messages):
+    app_settings = get_app_settings()
     ## make sure the messages are sorted by _ts descending
     title_prompt = 'Summarize the conversation so far into a 4-word or less title. Do not use any quotation marks or punctuation. Respond with a json object in the format {{"title": string}}. Do not include any other commentary or description.'
 
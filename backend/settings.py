@@ -1,9 +1,10 @@
 import os
-import json
 import logging
-from abc import ABC, abstractmethod
+import functools
 from pydantic import (
     BaseModel,
+    BeforeValidator,
+    computed_field,
     confloat,
     conint,
     conlist,
@@ -11,13 +12,19 @@ from pydantic import (
     field_validator,
     model_validator,
     PrivateAttr,
-    ValidationError,
-    ValidationInfo
+    TypeAdapter,
+    ValidationError
 )
-from pydantic.alias_generators import to_snake
-from pydantic_settings import BaseSettings, SettingsConfigDict
-from typing import List, Literal, Optional
+from pydantic_settings import (
+    BaseSettings,
+    DotEnvSettingsSource,
+    PydanticBaseSettingsSource,
+    SettingsConfigDict
+)
+from pydantic_settings.sources import parse_env_vars
+from typing import Annotated, Any, ClassVar, Dict, List, Literal, Optional, Union
 from typing_extensions import Self
+from dotenv import dotenv_values
 from quart import Request
 from backend.utils import parse_multi_columns, generateFilterString
 
@@ -31,15 +38,82 @@ DOTENV_PATH = os.environ.get(
     )
 )
 MINIMUM_SUPPORTED_AZURE_OPENAI_PREVIEW_API_VERSION = "2024-05-01-preview"
+DEFAULT_SYSTEM_MESSAGE = "You are an AI assistant that helps people find information."
+
+
+@functools.lru_cache(maxsize=64)
+def _split_columns_cached(value: str) -> tuple:
+    # Cached as a tuple so each caller gets its own list back.
+    return tuple(parse_multi_columns(value))
+
 
+def _split_multi_columns(value: Any) -> Any:
+    if isinstance(value, str):
+        return list(_split_columns_cached(value)) if value else None
+    
+    return value
+
+
+_MultiColumns = Annotated[Optional[List[str]], BeforeValidator(_split_multi_columns)]
 
-class _UiSettings(BaseSettings):
+
+@functools.lru_cache(maxsize=None)
+def _read_dotenv_file(path: str) -> Dict[str, Optional[str]]:
+    if not os.path.isfile(path):
+        return {}
+    
+    return dotenv_values(path, encoding="utf8")
+
+
+def _is_configured(env_name: str) -> bool:
+    # Matches how the settings sources look variables up: names are case
+    # insensitive and empty values are ignored.
+    env_name = env_name.lower()
+    return any(
+        name.lower() == env_name and value
+        for source in (os.environ, _read_dotenv_file(DOTENV_PATH))
+        for name, value in source.items()
+    )
+
+
+class _CachedDotEnvSettingsSource(DotEnvSettingsSource):
+    def _read_env_files(self) -> Dict[str, Optional[str]]:
+        return parse_env_vars(
+            _read_dotenv_file(self.env_file),
+            self.case_sensitive,
+            self.env_ignore_empty,
+            self.env_parse_none_str
+        )
+
+
+class _DotEnvSettings(BaseSettings):
     model_config = SettingsConfigDict(
-        env_prefix="UI_",
-        env_file=DOTENV_PATH,
         extra="ignore",
-        env_ignore_empty=True
+        env_ignore_empty=True,
+        frozen=True
     )
+    
+    # Every settings class reads the same dotenv file, so parse it once per
+    # process instead of once per class instantiation.
+    @classmethod
+    def settings_customise_sources(
+        cls,
+        settings_cls: type[BaseSettings],
+        init_settings: PydanticBaseSettingsSource,
+        env_settings: PydanticBaseSettingsSource,
+        dotenv_settings: PydanticBaseSettingsSource,
+        file_secret_settings: PydanticBaseSettingsSource,
+    ) -> tuple[PydanticBaseSettingsSource, ...]:
+        return (
+            init_settings,
+            env_settings,
+            _CachedDotEnvSettingsSource(settings_cls, env_file=DOTENV_PATH),
+            file_secret_settings
+        )
+
+
+class _UiSettings(_DotEnvSettings):
+    model_config = SettingsConfigDict(env_prefix="UI_")
 
     title: str = "Contoso"
     logo: Optional[str] = None
@@ -50,12 +124,10 @@ class _UiSettings(BaseSettings):
     show_share_button: bool = True
 
 
-class _ChatHistorySettings(BaseSettings):
+class _ChatHistorySettings(_DotEnvSettings):
     model_config = SettingsConfigDict(
         env_prefix="AZURE_COSMOSDB_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
 
     database: str
@@ -65,12 +137,10 @@ class _ChatHistorySettings(BaseSettings):
     enable_feedback: bool = False
 
 
-class _PromptflowSettings(BaseSettings):
+class _PromptflowSettings(_DotEnvSettings):
     model_config = SettingsConfigDict(
         env_prefix="PROMPTFLOW_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
 
     endpoint: str
@@ -90,15 +160,14 @@ class _AzureOpenAIFunction(BaseModel):
 class _AzureOpenAITool(BaseModel):
     type: Literal['function'] = 'function'
     function: _AzureOpenAIFunction
+
+
+_TOOLS_ADAPTER = TypeAdapter(List[_AzureOpenAITool])
+_LOGIT_BIAS_ADAPTER = TypeAdapter(Dict[str, int])
     
 
-class _AzureOpenAISettings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_prefix="AZURE_OPENAI_",
-        env_file=DOTENV_PATH,
-        extra='ignore',
-        env_ignore_empty=True
-    )
+class _AzureOpenAISettings(_DotEnvSettings):
+    model_config = SettingsConfigDict(env_prefix="AZURE_OPENAI_")
     
     model: str
     key: str
@@ -108,7 +177,7 @@ class _AzureOpenAISettings(BaseSettings):
     top_p: float = 0
     max_tokens: int = 1000
     stream: bool = True
-    stop_sequence: Optional[List[str]] = None
+    stop_sequence: _MultiColumns = None
     seed: Optional[int] = None
     choices_count: Optional[conint(ge=1, le=128)] = Field(default=1, serialization_alias="n")
     user: Optional[str] = None
@@ -117,7 +186,7 @@ class _AzureOpenAISettings(BaseSettings):
     logit_bias: Optional[dict] = None
     presence_penalty: Optional[confloat(ge=-2.0, le=2.0)] = 0.0
     frequency_penalty: Optional[confloat(ge=-2.0, le=2.0)] = 0.0
-    system_message: str = "You are an AI assistant that helps people find information."
+    system_message: str = DEFAULT_SYSTEM_MESSAGE
     preview_api_version: str = MINIMUM_SUPPORTED_AZURE_OPENAI_PREVIEW_API_VERSION
     embedding_endpoint: Optional[str] = None
     embedding_key: Optional[str] = None
@@ -125,50 +194,57 @@ class _AzureOpenAISettings(BaseSettings):
     
     @field_validator('tools', mode='before')
     @classmethod
-    def deserialize_tools(cls, tools_json_str: str) -> List[_AzureOpenAITool]:
-        if isinstance(tools_json_str, str):
-            try:
-                tools_dict = json.loads(tools_json_str)
-                return _AzureOpenAITool(**tools_dict)
-            except json.JSONDecodeError:
+    def deserialize_tools(cls, tools: Union[str, list, None]) -> Optional[List[_AzureOpenAITool]]:
+        # pydantic-settings already decodes valid JSON from the environment,
+        # so the value may arrive either as a string or as a list.
+        if tools is None:
+            return None
+        
+        try:
+            if isinstance(tools, str):
+                return _TOOLS_ADAPTER.validate_json(tools) or None
+            
+            return _TOOLS_ADAPTER.validate_python(tools) or None
+        
+        except ValidationError as e:
+            if any(error["type"] == "json_invalid" for error in e.errors()):
                 logging.warning("No valid tool definition found in the environment.  If you believe this to be in error, please check that the value of AZURE_OPENAI_TOOLS is a valid JSON string.")
             
-            except ValidationError as e:
-                logging.warning(f"An error occurred while deserializing the tool definition - {str(e)}")
+            else:
+                logging.warning("An error occurred while deserializing the tool definition - %s", e)
             
         return None
     
     @field_validator('logit_bias', mode='before')
     @classmethod
-    def deserialize_logit_bias(cls, logit_bias_json_str: str) -> dict:
-        if isinstance(logit_bias_json_str, str):
-            try:
-                return json.loads(logit_bias_json_str)
-            except json.JSONDecodeError as e:
-                logging.warning(f"An error occurred while deserializing the logit bias string -- {str(e)}")
-                
-        return None
+    def deserialize_logit_bias(cls, logit_bias: Union[str, dict, None]) -> Optional[Dict[str, int]]:
+        if logit_bias is None:
+            return None
         
-    @field_validator('stop_sequence', mode='before')
-    @classmethod
-    def split_contexts(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
+        try:
+            if isinstance(logit_bias, str):
+                return _LOGIT_BIAS_ADAPTER.validate_json(logit_bias)
+            
+            return _LOGIT_BIAS_ADAPTER.validate_python(logit_bias)
         
+        except ValidationError as e:
+            logging.warning("An error occurred while deserializing the logit bias string -- %s", e)
+                
         return None
-    
+        
     @model_validator(mode="after")
     def ensure_endpoint(self) -> Self:
-        if self.endpoint:
-            return Self
-        
-        elif self.resource:
-            self.endpoint = f"https://{self.resource}.openai.azure.com"
-            return Self
+        if not self.endpoint:
+            if not self.resource:
+                raise ValueError("AZURE_OPENAI_ENDPOINT or AZURE_OPENAI_RESOURCE is required")
+            
+            object.__setattr__(self, "endpoint", f"https://{self.resource}.openai.azure.com")
         
-        raise ValidationError("AZURE_OPENAI_ENDPOINT or AZURE_OPENAI_RESOURCE is required")
+        return self
         
+    @functools.cached_property
     def extract_embedding_dependency(self) -> Optional[dict]:
+        # Depends only on frozen settings, so it is built once per process.
         if self.embedding_name:
             return {
                 "type": "deployment_name",
@@ -188,68 +264,141 @@ class _AzureOpenAISettings(BaseSettings):
             return None
     
 
-class _SearchCommonSettings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_prefix="SEARCH_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+def _dump_payload_fields(model: BaseModel) -> dict:
+    # Equivalent to model_dump(exclude_none=True, by_alias=True), but calls the
+    # class's prebuilt pydantic-core serializer directly.
+    return model.__pydantic_serializer__.to_python(
+        model,
+        exclude_none=True,
+        by_alias=True
     )
+
+
+class _SearchCommonSettings(_DotEnvSettings):
+    model_config = SettingsConfigDict(env_prefix="SEARCH_")
     top_k: int = Field(default=5, serialization_alias="top_n_documents")
     strictness: int = 3
     enable_in_domain: bool = Field(default=True, serialization_alias="in_scope")
     max_search_queries: Optional[int] = None
     allow_partial_result: bool = False
-    include_contexts: Optional[List[str]] = ["citations", "intent"]
+    include_contexts: _MultiColumns = ["citations", "intent"]
     vectorization_dimensions: Optional[int] = None
     role_information: str = Field(
         validation_alias="AZURE_OPENAI_SYSTEM_MESSAGE"
     )
+    
+    @functools.cached_property
+    def payload_parameters(self) -> dict:
+        # Shared by every datasource payload; the settings are frozen, so
+        # the serialized form never changes.
+        return _dump_payload_fields(self)
 
-    @field_validator('include_contexts', mode='before')
-    @classmethod
-    def split_contexts(cls, comma_separated_string: str, info: ValidationInfo) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
-        return cls.model_fields[info.field_name].get_default()
+
+class _FieldsMappingMixin(BaseModel):
+    # Shared by the datasources that map index columns onto citation fields.
+    content_columns: _MultiColumns = Field(default=None, exclude=True)
+    vector_columns: _MultiColumns = Field(default=None, exclude=True)
+    title_column: Optional[str] = Field(default=None, exclude=True)
+    url_column: Optional[str] = Field(default=None, exclude=True)
+    filename_column: Optional[str] = Field(default=None, exclude=True)
+    
+    @computed_field
+    @property
+    def fields_mapping(self) -> dict:
+        return {
+            "content_fields": self.content_columns,
+            "title_field": self.title_column,
+            "url_field": self.url_column,
+            "filepath_field": self.filename_column,
+            "vector_fields": self.vector_columns
+        }
 
 
-class DatasourcePayloadConstructor(BaseModel, ABC):
+class DatasourcePayloadConstructor(BaseModel):
+    _type: ClassVar[str]
+    # Set by datasources that only support a single query type, which then
+    # needs no settings field.
+    _query_type: ClassVar[Optional[str]] = None
     _settings: '_AppSettings' = PrivateAttr()
+    _payload: Optional[dict] = PrivateAttr(default=None)
     
     def __init__(self, settings: '_AppSettings', **data):
+        # Datasource classes list this class before their settings base, so
+        # the parent settings object is taken out of the kwargs here and
+        # never goes through the pydantic-settings source merge.
         super().__init__(**data)
         self._settings = settings
     
-    @abstractmethod
+    def _get_payload(self) -> dict:
+        # The settings are frozen once loaded, so the payload is built a
+        # single time and shared by every request. Callers must treat it
+        # as read-only.
+        if self._payload is None:
+            self._payload = {
+                "type": self._type,
+                "parameters": self._construct_parameters()
+            }
+        
+        return self._payload
+    
+    def _construct_parameters(self) -> dict:
+        parameters = {
+            **_dump_payload_fields(self),
+            **self._settings.search.payload_parameters
+        }
+        if self._query_type:
+            parameters["query_type"] = self._query_type
+        
+        embedding_dependency = self._get_embedding_dependency()
+        if embedding_dependency:
+            parameters["embedding_dependency"] = embedding_dependency
+        
+        return parameters
+    
+    def _get_embedding_dependency(self) -> Optional[dict]:
+        return self._settings.azure_openai.extract_embedding_dependency
+    
     def construct_payload_configuration(
         self,
         *args,
         **kwargs
     ):
-        pass
+        return self._get_payload()
+
+
+# Azure AI Search accepts both camelCase and snake_case query types from the
+# environment, but the API expects snake_case.
+_QUERY_TYPE_SNAKE = {
+    "simple": "simple",
+    "vector": "vector",
+    "semantic": "semantic",
+    "vector_simple_hybrid": "vector_simple_hybrid",
+    "vectorSimpleHybrid": "vector_simple_hybrid",
+    "vector_semantic_hybrid": "vector_semantic_hybrid",
+    "vectorSemanticHybrid": "vector_semantic_hybrid"
+}
+
 
+# Has no per-deployment values, so every payload can share one instance.
+_SYSTEM_ASSIGNED_MANAGED_IDENTITY_AUTH = {"type": "system_assigned_managed_identity"}
 
-class _AzureSearchSettings(BaseSettings, DatasourcePayloadConstructor):
+
+class _AzureSearchSettings(
+    DatasourcePayloadConstructor,
+    _FieldsMappingMixin,
+    _DotEnvSettings
+):
     model_config = SettingsConfigDict(
         env_prefix="AZURE_SEARCH_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
-    _type: Literal["azure_search"] = PrivateAttr(default="azure_search")
+    _type: ClassVar[str] = "azure_search"
     service: str = Field(exclude=True)
     endpoint_suffix: str = Field(default="search.windows.net", exclude=True)
     index: str = Field(serialization_alias="index_name")
     key: Optional[str] = Field(default=None, exclude=True)
     use_semantic_search: bool = Field(default=False, exclude=True)
     semantic_search_config: str = Field(default="", serialization_alias="semantic_configuration")
-    content_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    vector_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    title_column: Optional[str] = Field(default=None, exclude=True)
-    url_column: Optional[str] = Field(default=None, exclude=True)
-    filename_column: Optional[str] = Field(default=None, exclude=True)
     query_type: Literal[
         'simple',
         'vector',
@@ -260,62 +409,37 @@ class _AzureSearchSettings(BaseSettings, DatasourcePayloadConstructor):
         'vectorSemanticHybrid'
     ] = "simple"
     permitted_groups_column: Optional[str] = Field(default=None, exclude=True)
-    
-    # Constructed fields
-    endpoint: Optional[str] = None
-    authentication: Optional[dict] = None
-    embedding_dependency: Optional[dict] = None
-    fields_mapping: Optional[dict] = None
     filter: Optional[str] = None
     
-    @field_validator('content_columns', 'vector_columns', mode="before")
+    @field_validator("query_type", mode="after")
     @classmethod
-    def split_columns(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
-        return None
+    def normalize_query_type(cls, query_type: str) -> str:
+        return _QUERY_TYPE_SNAKE[query_type]
     
-    @model_validator(mode="after")
-    def set_endpoint(self) -> Self:
-        self.endpoint = f"https://{self.service}.{self.endpoint_suffix}"
-        return self
+    @computed_field
+    @functools.cached_property
+    def endpoint(self) -> str:
+        return f"https://{self.service}.{self.endpoint_suffix}"
     
-    @model_validator(mode="after")
-    def set_authentication(self) -> Self:
+    @computed_field
+    @functools.cached_property
+    def authentication(self) -> dict:
         if self.key:
-            self.authentication = {"type": "api_key", "key": self.key}
-        else:
-            self.authentication = {"type": "system_assigned_managed_identity"}
-            
-        return self
-    
-    @model_validator(mode="after")
-    def set_fields_mapping(self) -> Self:
-        self.fields_mapping = {
-            "content_fields": self.content_columns,
-            "title_field": self.title_column,
-            "url_field": self.url_column,
-            "filepath_field": self.filename_column,
-            "vector_fields": self.vector_columns
-        }
-        return self
-    
-    @model_validator(mode="after")
-    def set_query_type(self) -> Self:
-        self.query_type = to_snake(self.query_type)
+            return {"type": "api_key", "key": self.key}
+        
+        return _SYSTEM_ASSIGNED_MANAGED_IDENTITY_AUTH
 
     def _set_filter_string(self, request: Request) -> str:
         if self.permitted_groups_column:
             user_token = request.headers.get("X-MS-TOKEN-AAD-ACCESS-TOKEN", "")
-            logging.debug(f"USER TOKEN is {'present' if user_token else 'not present'}")
+            logging.debug("USER TOKEN is %s", "present" if user_token else "not present")
             if not user_token:
                 raise ValueError(
                     "Document-level access control is enabled, but user access token could not be fetched."
                 )
 
             filter_string = generateFilterString(user_token)
-            logging.debug(f"FILTER: {filter_string}")
+            logging.debug("FILTER: %s", filter_string)
             return filter_string
         
         return None
@@ -326,396 +450,255 @@ class _AzureSearchSettings(BaseSettings, DatasourcePayloadConstructor):
         **kwargs
     ):
         request = kwargs.pop('request', None)
-        if request and self.permitted_groups_column:
-            self.filter = self._set_filter_string(request)
-            
-        self.embedding_dependency = \
-            self._settings.azure_openai.extract_embedding_dependency()
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
+        payload = self._get_payload()
+        if not (request and self.permitted_groups_column):
+            return payload
         
+        filter_string = self._set_filter_string(request)
         return {
             "type": self._type,
-            "parameters": parameters
+            "parameters": {**payload["parameters"], "filter": filter_string}
         }
 
 
 class _AzureCosmosDbMongoVcoreSettings(
-    BaseSettings,
-    DatasourcePayloadConstructor
+    DatasourcePayloadConstructor,
+    _FieldsMappingMixin,
+    _DotEnvSettings
 ):
     model_config = SettingsConfigDict(
         env_prefix="AZURE_COSMOSDB_MONGO_VCORE_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
-    _type: Literal["azure_cosmosdb"] = PrivateAttr(default="azure_cosmosdb")
-    query_type: Literal['vector'] = "vector"
+    _type: ClassVar[str] = "azure_cosmosdb"
+    _query_type: ClassVar[str] = "vector"
     connection_string: str = Field(exclude=True)
     index: str = Field(serialization_alias="index_name")
     database: str = Field(serialization_alias="database_name")
     container: str = Field(serialization_alias="container_name")
-    content_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    vector_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    title_column: Optional[str] = Field(default=None, exclude=True)
-    url_column: Optional[str] = Field(default=None, exclude=True)
-    filename_column: Optional[str] = Field(default=None, exclude=True)
     
-    # Constructed fields
-    authentication: Optional[dict] = None
-    embedding_dependency: Optional[dict] = None
-    fields_mapping: Optional[dict] = None
-    
-    @field_validator('content_columns', 'vector_columns', mode="before")
-    @classmethod
-    def split_columns(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
-        return None
-    
-    @model_validator(mode="after")
-    def construct_authentication(self) -> Self:
-        self.authentication = {
+    @computed_field
+    @functools.cached_property
+    def authentication(self) -> dict:
+        return {
             "type": "connection_string",
             "connection_string": self.connection_string
         }
-        return self
-    
-    @model_validator(mode="after")
-    def set_fields_mapping(self) -> Self:
-        self.fields_mapping = {
-            "content_fields": self.content_columns,
-            "title_field": self.title_column,
-            "url_field": self.url_column,
-            "filepath_field": self.filename_column,
-            "vector_fields": self.vector_columns
-        }
-        return self
-    
-    def construct_payload_configuration(
-        self,
-        *args,
-        **kwargs
-    ):
-        self.embedding_dependency = \
-            self._settings.azure_openai.extract_embedding_dependency()
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
-        return {
-            "type": self._type,
-            "parameters": parameters
-        }
 
 
-class _ElasticsearchSettings(BaseSettings, DatasourcePayloadConstructor):
+class _ElasticsearchSettings(
+    DatasourcePayloadConstructor,
+    _FieldsMappingMixin,
+    _DotEnvSettings
+):
     model_config = SettingsConfigDict(
         env_prefix="ELASTICSEARCH_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
-    _type: Literal["elasticsearch"] = PrivateAttr(default="elasticsearch")
+    _type: ClassVar[str] = "elasticsearch"
     endpoint: str
     encoded_api_key: str = Field(exclude=True)
     index: str = Field(serialization_alias="index_name")
     query_type: Literal['simple', 'vector'] = "simple"
-    content_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    vector_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    title_column: Optional[str] = Field(default=None, exclude=True)
-    url_column: Optional[str] = Field(default=None, exclude=True)
-    filename_column: Optional[str] = Field(default=None, exclude=True)
     embedding_model_id: Optional[str] = Field(default=None, exclude=True)
     
-    # Constructed fields
-    authentication: Optional[dict] = None
-    embedding_dependency: Optional[dict] = None
-    fields_mapping: Optional[dict] = None
-    
-    @field_validator('content_columns', 'vector_columns', mode="before")
-    @classmethod
-    def split_columns(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
-        return None
-    
-    @model_validator(mode="after")
-    def set_authentication(self) -> Self:
-        self.authentication = {
+    @computed_field
+    @functools.cached_property
+    def authentication(self) -> dict:
+        return {
             "type": "encoded_api_key",
             "encoded_api_key": self.encoded_api_key
         }
-        
-        return self
-    
-    @model_validator(mode="after")
-    def set_fields_mapping(self) -> Self:
-        self.fields_mapping = {
-            "content_fields": self.content_columns,
-            "title_field": self.title_column,
-            "url_field": self.url_column,
-            "filepath_field": self.filename_column,
-            "vector_fields": self.vector_columns
-        }
-        return self
     
-    def construct_payload_configuration(
-        self,
-        *args,
-        **kwargs
-    ):
-        self.embedding_dependency = \
-            {"type": "model_id", "model_id": self.embedding_model_id} if self.embedding_model_id else \
-            self._settings.azure_openai.extract_embedding_dependency() 
-            
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
-                
-        return {
-            "type": self._type,
-            "parameters": parameters
-        }
+    def _get_embedding_dependency(self) -> Optional[dict]:
+        if self.embedding_model_id:
+            return {"type": "model_id", "model_id": self.embedding_model_id}
+        
+        return super()._get_embedding_dependency()
 
 
-class _PineconeSettings(BaseSettings, DatasourcePayloadConstructor):
+class _PineconeSettings(
+    DatasourcePayloadConstructor,
+    _FieldsMappingMixin,
+    _DotEnvSettings
+):
     model_config = SettingsConfigDict(
         env_prefix="PINECONE_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
-    _type: Literal["pinecone"] = PrivateAttr(default="pinecone")
+    _type: ClassVar[str] = "pinecone"
+    _query_type: ClassVar[str] = "vector"
     environment: str
     api_key: str = Field(exclude=True)
     index_name: str
-    query_type: Literal["vector"] = "vector"
-    content_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    vector_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    title_column: Optional[str] = Field(default=None, exclude=True)
-    url_column: Optional[str] = Field(default=None, exclude=True)
-    filename_column: Optional[str] = Field(default=None, exclude=True)
-    
-    # Constructed fields
-    authentication: Optional[dict] = None
-    embedding_dependency: Optional[dict] = None
-    fields_mapping: Optional[dict] = None
-    
-    @field_validator('content_columns', 'vector_columns', mode="before")
-    @classmethod
-    def split_columns(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
-        return None
     
-    @model_validator(mode="after")
-    def set_authentication(self) -> Self:
-        self.authentication = {
+    @computed_field
+    @functools.cached_property
+    def authentication(self) -> dict:
+        return {
             "type": "api_key",
             "api_key": self.api_key
         }
-        
-        return self
-    
-    @model_validator(mode="after")
-    def set_fields_mapping(self) -> Self:
-        self.fields_mapping = {
-            "content_fields": self.content_columns,
-            "title_field": self.title_column,
-            "url_field": self.url_column,
-            "filepath_field": self.filename_column,
-            "vector_fields": self.vector_columns
-        }
-        return self
-    
-    def construct_payload_configuration(
-        self,
-        *args,
-        **kwargs
-    ):
-        self.embedding_dependency = \
-            self._settings.azure_openai.extract_embedding_dependency()
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
-        
-        return {
-            "type": self._type,
-            "parameters": parameters
-        }
 
 
-class _AzureMLIndexSettings(BaseSettings, DatasourcePayloadConstructor):
+class _AzureMLIndexSettings(
+    DatasourcePayloadConstructor,
+    _FieldsMappingMixin,
+    _DotEnvSettings
+):
     model_config = SettingsConfigDict(
         env_prefix="AZURE_MLINDEX_",
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        env_ignore_empty=True
+        defer_build=True
     )
-    _type: Literal["azure_ml_index"] = PrivateAttr(default="azure_ml_index")
+    _type: ClassVar[str] = "azure_ml_index"
     name: str
     version: str
     project_resource_id: str = Field(validation_alias="AZURE_ML_PROJECT_RESOURCE_ID")
-    content_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    vector_columns: Optional[List[str]] = Field(default=None, exclude=True)
-    title_column: Optional[str] = Field(default=None, exclude=True)
-    url_column: Optional[str] = Field(default=None, exclude=True)
-    filename_column: Optional[str] = Field(default=None, exclude=True)
     
-    # Constructed fields
-    fields_mapping: Optional[dict] = None
-    
-    @field_validator('content_columns', 'vector_columns', mode="before")
-    @classmethod
-    def split_columns(cls, comma_separated_string: str) -> List[str]:
-        if isinstance(comma_separated_string, str) and len(comma_separated_string) > 0:
-            return parse_multi_columns(comma_separated_string)
-        
+    def _get_embedding_dependency(self) -> Optional[dict]:
+        # The index carries its own embeddings.
         return None
-    
-    @model_validator(mode="after")
-    def set_fields_mapping(self) -> Self:
-        self.fields_mapping = {
-            "content_fields": self.content_columns,
-            "title_field": self.title_column,
-            "url_field": self.url_column,
-            "filepath_field": self.filename_column,
-            "vector_fields": self.vector_columns
-        }
-        return self
-    
-    def construct_payload_configuration(
-        self,
-        *args,
-        **kwargs
-    ):
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
-        
-        return {
-            "type": self._type,
-            "parameters": parameters
-        }
 
 
-class _AzureSqlServerSettings(BaseSettings, DatasourcePayloadConstructor):
+class _AzureSqlServerSettings(DatasourcePayloadConstructor, _DotEnvSettings):
     model_config = SettingsConfigDict(
         env_prefix="AZURE_SQL_SERVER_",
-        env_file=DOTENV_PATH,
-        extra="ignore"
+        env_ignore_empty=False,
+        defer_build=True
     )
-    _type: Literal["azure_sql_server"] = PrivateAttr(default="azure_sql_server")
+    _type: ClassVar[str] = "azure_sql_server"
     
     connection_string: str = Field(exclude=True)
     table_schema: str
     schema_max_row: Optional[int] = None
     top_n_results: Optional[int] = None
     
-    # Constructed fields
-    authentication: Optional[dict] = None
-    
-    @model_validator(mode="after")
-    def construct_authentication(self) -> Self:
-        self.authentication = {
+    @computed_field
+    @functools.cached_property
+    def authentication(self) -> dict:
+        return {
             "type": "connection_string",
             "connection_string": self.connection_string
         }
-        return self
     
-    def construct_payload_configuration(
-        self,
-        *args,
-        **kwargs
-    ):
-        parameters = self.model_dump(exclude_none=True, by_alias=True)
-        #parameters.update(self._settings.search.model_dump(exclude_none=True, by_alias=True))
-        
-        return {
-            "type": self._type,
-            "parameters": parameters
-        }
+    def _construct_parameters(self) -> dict:
+        # The SQL Server datasource does not take the common search parameters.
+        return _dump_payload_fields(self)
     
     
-class _BaseSettings(BaseSettings):
-    model_config = SettingsConfigDict(
-        env_file=DOTENV_PATH,
-        extra="ignore",
-        arbitrary_types_allowed=True,
-        env_ignore_empty=True
-    )
+# Keyed by DATASOURCE_TYPE.
+_DATASOURCE_SETTINGS: Dict[str, type[DatasourcePayloadConstructor]] = {
+    "AzureCognitiveSearch": _AzureSearchSettings,
+    "AzureCosmosDB": _AzureCosmosDbMongoVcoreSettings,
+    "Elasticsearch": _ElasticsearchSettings,
+    "Pinecone": _PineconeSettings,
+    "AzureMLIndex": _AzureMLIndexSettings,
+    "AzureSqlServer": _AzureSqlServerSettings
+}
+
+
+class _BaseSettings(_DotEnvSettings):
+    model_config = SettingsConfigDict(arbitrary_types_allowed=True)
     datasource_type: Optional[str] = None
     auth_enabled: bool = False
     sanitize_answer: bool = False
     use_promptflow: bool = False
 
 
-class _AppSettings(BaseModel):
-    base_settings: _BaseSettings = _BaseSettings()
-    azure_openai: _AzureOpenAISettings = _AzureOpenAISettings()
-    search: _SearchCommonSettings = _SearchCommonSettings()
-    ui: Optional[_UiSettings] = _UiSettings()
+@functools.lru_cache(maxsize=1)
+def get_base_settings() -> _BaseSettings:
+    return _BaseSettings()
+
+
+@functools.lru_cache(maxsize=1)
+def get_azure_openai_settings() -> _AzureOpenAISettings:
+    return _AzureOpenAISettings()
+
+
+@functools.lru_cache(maxsize=1)
+def get_search_settings() -> _SearchCommonSettings:
+    return _SearchCommonSettings()
+
+
+@functools.lru_cache(maxsize=1)
+def get_ui_settings() -> _UiSettings:
+    return _UiSettings()
+
+
+@functools.lru_cache(maxsize=1)
+def get_chat_history_settings() -> Optional[_ChatHistorySettings]:
+    # Chat history is optional, so skip validation when it is clearly not set up.
+    if not _is_configured("AZURE_COSMOSDB_ACCOUNT"):
+        return None
     
-    # Constructed properties
-    chat_history: Optional[_ChatHistorySettings] = None
-    datasource: Optional[DatasourcePayloadConstructor] = None
-    promptflow: Optional[_PromptflowSettings] = None
+    try:
+        return _ChatHistorySettings()
 
-    @model_validator(mode="after")
-    def set_promptflow_settings(self) -> Self:
-        try:
-            self.promptflow = _PromptflowSettings()
-            
-        except ValidationError:
-            self.promptflow = None
-            
-        return self
+    except ValidationError:
+        return None
+
+
+@functools.lru_cache(maxsize=1)
+def get_promptflow_settings() -> Optional[_PromptflowSettings]:
+    if not _is_configured("PROMPTFLOW_ENDPOINT"):
+        return None
     
-    @model_validator(mode="after")
-    def set_chat_history_settings(self) -> Self:
-        try:
-            self.chat_history = _ChatHistorySettings()
-        
-        except ValidationError:
-            self.chat_history = None
-        
-        return self
+    try:
+        return _PromptflowSettings()
+
+    except ValidationError:
+        return None
+
+
+def clear_settings_cache() -> None:
+    get_app_settings.cache_clear()
+    _read_dotenv_file.cache_clear()
+    get_base_settings.cache_clear()
+    get_azure_openai_settings.cache_clear()
+    get_search_settings.cache_clear()
+    get_ui_settings.cache_clear()
+    get_chat_history_settings.cache_clear()
+    get_promptflow_settings.cache_clear()
+
+
+class _AppSettings(BaseModel):
+    base_settings: _BaseSettings = Field(default_factory=get_base_settings)
+    azure_openai: _AzureOpenAISettings = Field(default_factory=get_azure_openai_settings)
+    search: _SearchCommonSettings = Field(default_factory=get_search_settings)
+    ui: Optional[_UiSettings] = Field(default_factory=get_ui_settings)
     
-    @model_validator(mode="after")
-    def set_datasource_settings(self) -> Self:
+    # Constructed properties
+    # Chat history and promptflow are optional and defer their schema builds,
+    # so they are kept out of this model's fields and only built on access.
+    @functools.cached_property
+    def chat_history(self) -> Optional[_ChatHistorySettings]:
+        return get_chat_history_settings()
+    
+    @functools.cached_property
+    def promptflow(self) -> Optional[_PromptflowSettings]:
+        return get_promptflow_settings()
+    
+    @functools.cached_property
+    def datasource(self) -> Optional[DatasourcePayloadConstructor]:
+        # Built on first access so that only the configured datasource is
+        # ever validated, and only when a request actually needs it.
+        datasource_settings = _DATASOURCE_SETTINGS.get(self.base_settings.datasource_type)
+        if datasource_settings is None:
+            logging.warning("No datasource configuration found in the environment -- calls will be made to Azure OpenAI without grounding data.")
+            return None
+        
         try:
-            if self.base_settings.datasource_type == "AzureCognitiveSearch":
-                self.datasource = _AzureSearchSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using Azure Cognitive Search")
-            
-            elif self.base_settings.datasource_type == "AzureCosmosDB":
-                self.datasource = _AzureCosmosDbMongoVcoreSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using Azure CosmosDB Mongo vcore")
-            
-            elif self.base_settings.datasource_type == "Elasticsearch":
-                self.datasource = _ElasticsearchSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using Elasticsearch")
-            
-            elif self.base_settings.datasource_type == "Pinecone":
-                self.datasource = _PineconeSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using Pinecone")
-            
-            elif self.base_settings.datasource_type == "AzureMLIndex":
-                self.datasource = _AzureMLIndexSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using Azure ML Index")
-            
-            elif self.base_settings.datasource_type == "AzureSqlServer":
-                self.datasource = _AzureSqlServerSettings(settings=self, _env_file=DOTENV_PATH)
-                logging.debug("Using SQL Server")
-                
-            else:
-                self.datasource = None
-                logging.warning("No datasource configuration found in the environment -- calls will be made to Azure OpenAI without grounding data.")
-                
-            return self
+            datasource = datasource_settings(settings=self)
+            logging.debug("Using %s", datasource_settings.__name__)
+            return datasource
 
         except ValidationError:
             logging.warning("No datasource configuration found in the environment -- calls will be made to Azure OpenAI without grounding data.")
+            return None
 
 
-app_settings = _AppSettings()
+@functools.lru_cache(maxsize=1)
+def get_app_settings() -> _AppSettings:
+    # Every field comes from a factory that returns an already-validated,
+    # cached settings object, so the container itself needs no validation pass.
+    return _AppSettings.model_construct()
@@ -1,5 +1,7 @@
 import os
 import json
+import time
+import hashlib
 import logging
 import requests
 import dataclasses
@@ -39,7 +41,7 @@ def parse_multi_columns(columns: str) -> list:
 
 
 def fetchUserGroups(userToken, nextLink=None):
-    # Recursively fetch group membership
+    # Recursively fetch group membership. Returns None if the lookup failed.
     if nextLink:
         endpoint = nextLink
     else:
@@ -50,20 +52,41 @@ def fetchUserGroups(userToken, nextLink=None):
         r = requests.get(endpoint, headers=headers)
         if r.status_code != 200:
             logging.error(f"Error fetching user groups: {r.status_code} {r.text}")
-            return []
+            return None
 
         r = r.json()
         if "@odata.nextLink" in r:
             nextLinkData = fetchUserGroups(userToken, r["@odata.nextLink"])
+            if nextLinkData is None:
+                return None
             r["value"].extend(nextLinkData)
 
         return r["value"]
     except Exception as e:
         logging.error(f"Exception in fetchUserGroups: {e}")
-        return []
+        return None
+
+
+# Group membership is fetched from Microsoft Graph, so reuse the filter for a
+# token the user has already presented instead of calling Graph on every turn.
+# Entries are keyed by a hash of the token so raw bearer tokens are not kept
+# in memory, and expire so membership changes are picked up.
+FILTER_CACHE_TTL_SECONDS = 300
+FILTER_CACHE_MAX_ENTRIES = 1024
+_filter_cache = {}
+
+
+def clear_filter_cache():
+    _filter_cache.clear()
 
 
 def generateFilterString(userToken):
+    cache_key = hashlib.sha256(userToken.encode("utf-8")).hexdigest()
+    now = time.monotonic()
+    cached = _filter_cache.get(cache_key)
+    if cached and cached[0] > now:
+        return cached[1]
+
     # Get list of groups user is a member of
     userGroups = fetchUserGroups(userToken)
 
@@ -71,8 +94,20 @@ def generateFilterString(userToken):
     if not userGroups:
         logging.debug("No user groups found")
 
-    group_ids = ", ".join([obj["id"] for obj in userGroups])
-    return f"{AZURE_SEARCH_PERMITTED_GROUPS_COLUMN}/any(g:search.in(g, '{group_ids}'))"
+    group_ids = ", ".join([obj["id"] for obj in userGroups or []])
+    filter_string = f"{AZURE_SEARCH_PERMITTED_GROUPS_COLUMN}/any(g:search.in(g, '{group_ids}'))"
+
+    # A failed lookup is not cached, so a transient Graph error only affects
+    # the current request.
+    if userGroups is not None:
+        if len(_filter_cache) >= FILTER_CACHE_MAX_ENTRIES:
+            for key in [key for key, (expires, _) in _filter_cache.items() if expires <= now]:
+                del _filter_cache[key]
+            if len(_filter_cache) >= FILTER_CACHE_MAX_ENTRIES:
+                del _filter_cache[next(iter(_filter_cache))]
+        _filter_cache[cache_key] = (now + FILTER_CACHE_TTL_SECONDS, filter_string)
+
+    return filter_string
 
 
 def format_non_streaming_response(chatCompletion, history_metadata, apim_request_id):
@@ -157,7 +192,7 @@ def format_pf_non_streaming_response(
         logging.error(f"Error in promptflow response api: {chatCompletion['error']}")
         return {"error": chatCompletion["error"]}
 
-    logging.debug(f"chatCompletion: {chatCompletion}")
+    logging.debug("chatCompletion: %s", chatCompletion)
     try:
         messages = []
         if response_field_name in chatCompletion:
@@ -190,7 +225,7 @@ def format_pf_non_streaming_response(
 
 def convert_to_pf_format(input_json, request_field_name, response_field_name):
     output_json = []
-    logging.debug(f"Input json: {input_json}")
+    logging.debug("Input json: %s", input_json)
     # align the input json to the format expected by promptflow chat flow
     for message in input_json["messages"]:
         if message:
@@ -202,7 +237,7 @@ def convert_to_pf_format(input_json, request_field_name, response_field_name):
                 output_json.append(new_obj)
             elif message["role"] == "assistant" and len(output_json) > 0:
                 output_json[-1]["outputs"][response_field_name] = message["content"]
-    logging.debug(f"PF formatted response: {output_json}")
+    logging.debug("PF formatted response: %s", output_json)
     return output_json
 
 
@@ -1,6 +1,7 @@
 import os
 import pytest
 from importlib import import_module, reload
+from types import SimpleNamespace
 
 
 @pytest.fixture(scope="function")
@@ -20,7 +21,7 @@ def app_settings(dotenv_path):
     settings_module = import_module("backend.settings")
     settings_module = reload(settings_module)
     
-    yield getattr(settings_module, "app_settings")
+    yield settings_module.get_app_settings()
 
 
 def test_dotenv_no_datasource_1(app_settings):    
@@ -52,6 +53,28 @@ def test_dotenv_with_azure_search_success(app_settings):
     print(payload)
 
 
+
+def test_dotenv_with_azure_search_permitted_groups(app_settings, monkeypatch):
+    settings_module = import_module("backend.settings")
+    monkeypatch.setattr(
+        settings_module,
+        "generateFilterString",
+        lambda user_token: f"group_ids/any(g:search.in(g, '{user_token}'))"
+    )
+
+    def request_with_token(token):
+        return SimpleNamespace(headers={"X-MS-TOKEN-AAD-ACCESS-TOKEN": token})
+
+    datasource = app_settings.datasource
+    first = datasource.construct_payload_configuration(request=request_with_token("user1"))
+    second = datasource.construct_payload_configuration(request=request_with_token("user2"))
+    assert first["parameters"]["filter"] == "group_ids/any(g:search.in(g, 'user1'))"
+    assert second["parameters"]["filter"] == "group_ids/any(g:search.in(g, 'user2'))"
+
+    # The per-user filter must not leak into later payloads
+    payload = datasource.construct_payload_configuration()
+    assert payload["parameters"]["filter"] == "category eq 'public'"
+
 def test_dotenv_with_elasticsearch_success(app_settings):
     # Validate model object
     assert app_settings.search is not None
@@ -66,7 +89,25 @@ def test_dotenv_with_elasticsearch_success(app_settings):
     assert payload["parameters"] is not None
     assert payload["parameters"]["endpoint"] == "dummy"
     print(payload)
-    
-    
-    
 
+
+def test_dotenv_with_azure_openai_tools(app_settings):
+    # Validate model object
+    assert app_settings.azure_openai is not None
+    assert app_settings.azure_openai.tools is not None
+    assert len(app_settings.azure_openai.tools) == 1
+    assert app_settings.azure_openai.tools[0].function.name == "get_weather"
+
+
+def test_dotenv_file_is_parsed_once():
+    os.environ["DOTENV_PATH"] = os.path.join(
+        os.path.dirname(__file__),
+        "dotenv_data",
+        "dotenv_with_azure_search_success"
+    )
+    settings_module = reload(import_module("backend.settings"))
+    
+    assert settings_module.get_app_settings().datasource is not None
+    cache_info = settings_module._read_dotenv_file.cache_info()
+    assert cache_info.misses == 1
+    assert cache_info.hits > 0
@@ -1,4 +1,5 @@
 import pytest
+from backend import utils
 from backend.utils import format_as_ndjson, parse_multi_columns
 
 
@@ -27,3 +28,62 @@ def test_parse_multi_columns():
     assert parse_multi_columns(test_pipes) == ["col1", "col2", "col3"]
     assert parse_multi_columns(test_commas) == ["col1", "col2", "col3"]
     assert parse_multi_columns(test_single) == ["col1"]
+
+
+def test_generate_filter_string_is_cached(monkeypatch):
+    calls = []
+
+    def dummy_fetch_user_groups(userToken, nextLink=None):
+        calls.append(userToken)
+        return [{"id": "group1"}, {"id": "group2"}]
+
+    monkeypatch.setattr(utils, "fetchUserGroups", dummy_fetch_user_groups)
+    monkeypatch.setattr(utils, "_filter_cache", {})
+
+    first = utils.generateFilterString("token")
+    second = utils.generateFilterString("token")
+    assert first == second
+    assert "group1, group2" in first
+    assert calls == ["token"]
+
+
+def test_generate_filter_string_does_not_cache_errors(monkeypatch):
+    results = [None, [{"id": "group1"}]]
+    calls = []
+
+    def dummy_fetch_user_groups(userToken, nextLink=None):
+        calls.append(userToken)
+        return results[len(calls) - 1]
+
+    monkeypatch.setattr(utils, "fetchUserGroups", dummy_fetch_user_groups)
+    monkeypatch.setattr(utils, "_filter_cache", {})
+
+    failed = utils.generateFilterString("token")
+    assert "search.in(g, '')" in failed
+    assert not utils._filter_cache
+
+    recovered = utils.generateFilterString("token")
+    assert "group1" in recovered
+    assert calls == ["token", "token"]
+
+
+def test_generate_filter_string_cache_expires(monkeypatch):
+    calls = []
+    now = [1000.0]
+
+    def dummy_fetch_user_groups(userToken, nextLink=None):
+        calls.append(userToken)
+        return [{"id": "group1"}]
+
+    monkeypatch.setattr(utils, "fetchUserGroups", dummy_fetch_user_groups)
+    monkeypatch.setattr(utils, "_filter_cache", {})
+    monkeypatch.setattr(utils.time, "monotonic", lambda: now[0])
+
+    utils.generateFilterString("token")
+    now[0] += utils.FILTER_CACHE_TTL_SECONDS - 1
+    utils.generateFilterString("token")
+    assert calls == ["token"]
+
+    now[0] += 1
+    utils.generateFilterString("token")
+    assert calls == ["token", "token"]